@@ -0,0 +1,50 @@
+import click
+
+import utils.utils as utils
+
+
+# Parses a score distribution given as <name>:<parameter>,<parameter>,...
+# (e.g. normal:0.7,0.1 or exponential:0.5) into (<name>, <parameters>...).
+def parse_distribution(ctx, param, value):
+    name, _, parameters = value.partition(":")
+    try:
+        distribution = (name, *[float(p) for p in parameters.split(",") if len(p) > 0])
+        utils._check_distribution(distribution)
+    except ValueError as e:
+        raise click.BadParameter(str(e)) from e
+
+    return distribution
+
+
+@click.command()
+@click.argument("file_path")
+@click.option("--count", default=10000, help="Number of observations to generate")
+@click.option("--seed", default=0, help="Seed of the random number generator")
+@click.option("--genuine", default="normal:0.7,0.1", callback=parse_distribution, help="Genuine score distribution, as a numpy.random.Generator method and its parameters")
+@click.option("--impostor", default="normal:0.3,0.1", callback=parse_distribution, help="Impostor score distribution, as a numpy.random.Generator method and its parameters")
+@click.option("--genuine-ratio", default=0.5, help="Expected fraction of genuine observations")
+@click.option("--decimals", default=4, help="Number of decimals kept in each score")
+@click.option("--tie-rate", default=0.0, help="Probability of repeating the previous score")
+@click.option("--dissimilar", is_flag=True, help="Generate dissimilarity scores")
+@click.option("--binary", is_flag=True, help="Write float32 FILE_PATH.genuine and FILE_PATH.impostor files")
+def generate_data(file_path, count, seed, genuine, impostor, genuine_ratio, decimals, tie_rate, dissimilar, binary):
+    """Writes COUNT synthetic <label>,<score> observations to FILE_PATH.\n
+        The same options always generate the same file.
+        FILE_PATH ending in .gz, .bz2 or .xz is compressed.
+    """
+    utils.generate_data(
+        file_path,
+        count,
+        seed=seed,
+        genuine=genuine,
+        impostor=impostor,
+        genuine_ratio=genuine_ratio,
+        decimals=decimals,
+        tie_rate=tie_rate,
+        is_similar=not dissimilar,
+        binary=binary,
+    )
+
+
+if __name__ == "__main__":
+    generate_data()
@@ -0,0 +1,37 @@
+import utils.utils as utils
+
+
+# Reports the deviation of the compact (float32) storage mode
+# from the default float64 path on the bundled data files.
+def main():
+    file_paths = ["src/data/s1.csv", "src/data/s2.csv", "src/data/s3.csv"]
+
+    print("Compact storage validation (|float64 - float32|)")
+    for file_path in file_paths:
+        full = utils.load_data(file_path)
+        compact = utils.load_data(file_path, compact=True)
+
+        full_fnmr, full_fmr, full_threshold = utils.compute_sim_fmr_fnmr_eer(full)
+        compact_fnmr, compact_fmr, compact_threshold = utils.compute_sim_fmr_fnmr_eer(compact)
+        # deviations are computed in float64
+        compact_threshold = float(compact_threshold)
+        full_eer = (full_fnmr + full_fmr) / 2.0
+        compact_eer = (compact_fnmr + compact_fmr) / 2.0
+
+        full_auc = utils.compute_sim_fmr_tmr_auc(full)[0]
+        compact_auc = float(utils.compute_sim_fmr_tmr_auc(compact)[0])
+
+        full_d_prime = utils.compute_d_prime(full)
+        compact_d_prime = float(utils.compute_d_prime(compact))
+
+        print(f"{file_path}:")
+        print(f"  EER: {full_eer:.6f} vs {compact_eer:.6f} deviation: {abs(full_eer - compact_eer):.3e}")
+        print(f"  EER threshold: {full_threshold:.6f} vs {compact_threshold:.6f} deviation: {abs(full_threshold - compact_threshold):.3e}")
+        print(f"  AUC: {full_auc:.6f} vs {compact_auc:.6f} deviation: {abs(full_auc - compact_auc):.3e}")
+        print(f"  d': {full_d_prime:.6f} vs {compact_d_prime:.6f} deviation: {abs(full_d_prime - compact_d_prime):.3e}")
+
+    print("Compact storage validation completed.")
+
+
+if __name__ == "__main__":
+    main()
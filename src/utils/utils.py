@@ -1,28 +1,87 @@
 """Auxiliary and Utility Functions"""
 
-import matplotlib.pyplot as plt
+import bz2
+import codecs
+import gzip
+import locale
+import lzma
+import multiprocessing
+import os
+import queue
+import threading
+from array import array
+from contextlib import ExitStack
+from multiprocessing import shared_memory
 
-"""Sums all the values in the given list,
+import matplotlib.pyplot as plt
+import numpy as np
+
+# Minimum number of scores per worker for the parallel sort to pay off.
+_PARALLEL_SORT_MIN_CHUNK = 100000
+
+# Openers of the supported compressed files, by file extension.
+_COMPRESSED_OPENERS = {".gz": gzip.open, ".bz2": bz2.open, ".xz": lzma.open}
+
+# Size in bytes of each block decompressed ahead by the background reader,
+# and maximum number of blocks waiting to be parsed.
+_READ_BLOCK_SIZE = 1 << 20
+_READ_AHEAD_BLOCKS = 8
+
+# Number of values whose deviations are computed at a time by _compute_var.
+_VAR_CHUNK_SIZE = 16384
+
+# Number of synthetic observations generated and written at a time.
+_GENERATE_CHUNK_SIZE = 100000
+
+# Methods of numpy.random.Generator that can be used as score distributions.
+_DISTRIBUTIONS = {
+    "beta",
+    "chisquare",
+    "exponential",
+    "f",
+    "gamma",
+    "gumbel",
+    "laplace",
+    "logistic",
+    "lognormal",
+    "normal",
+    "pareto",
+    "power",
+    "rayleigh",
+    "standard_cauchy",
+    "standard_normal",
+    "standard_t",
+    "triangular",
+    "uniform",
+    "vonmises",
+    "wald",
+    "weibull",
+}
+
+"""Sums all the values in the given list (or in its [start, end) range),
 using pairwise summation to reduce round-off error."""
 
 
-def _pairwise_sum(values):
+def _pairwise_sum(values, start=0, end=None):
     sum = float("NaN")  # nothing computed, returns not-a-number
 
-    if len(values) == 0:
+    if end is None:
+        end = len(values)
+
+    if end - start == 0:
         sum = 0.0  # nothing to sum, returns zero
 
-    elif len(values) == 1:
-        sum = float(values[0])  # one element, returns it
+    elif end - start == 1:
+        sum = float(values[start])  # one element, returns it
 
-    elif len(values) == 2:
-        sum = float(values[0] + values[1])  # two elements, returns their sum
+    elif end - start == 2:
+        sum = float(values[start] + values[start + 1])  # two elements, returns their sum
 
     else:
-        i = int(len(values) / 2)
-        sum = _pairwise_sum(values[0:i]) + _pairwise_sum(
-            values[i : len(values)]
-        )  # recursive call
+        i = start + int((end - start) / 2)
+        sum = _pairwise_sum(values, start, i) + _pairwise_sum(
+            values, i, end
+        )  # recursive call, on ranges so that no values are copied
 
     return sum
 
@@ -35,41 +94,392 @@ def _compute_var(values):
         # mean of values
         mean = _pairwise_sum(values) / len(values)
 
-        # deviations
-        deviations = [(v - mean) ** 2.0 for v in values]
+        # sums of the deviations, computed in chunks to bound memory use
+        deviation_sums = []
+        for start in range(0, len(values), _VAR_CHUNK_SIZE):
+            deviations = [
+                (v - mean) ** 2.0 for v in values[start : start + _VAR_CHUNK_SIZE]
+            ]
+            deviation_sums.append(_pairwise_sum(deviations))
 
         # variance
-        var = _pairwise_sum(deviations) / len(deviations)
+        var = _pairwise_sum(deviation_sums) / len(values)
 
     return var
 
 
+# Returns the smallest float32 value not lower than the given threshold
+# and the largest float32 value not greater than it, so that float32 scores
+# can be compared against the threshold without being upcast.
+def _float32_threshold(threshold):
+    lower = upper = np.float32(threshold)
+
+    # compared as float64, or the threshold would be rounded to float32 as well
+    if float(upper) < threshold:
+        upper = np.nextafter(upper, np.float32("inf"))
+    if float(lower) > threshold:
+        lower = np.nextafter(lower, np.float32("-inf"))
+
+    return upper, lower
+
+
+# Compact, opt-in storage for loaded observations.
+# Scores are kept as float32 in two per-class arrays, so no labels are stored;
+# genuine observations are always reported back with label 1.
+# It can be given to every function below in place of an array of (<label>,<score>) elements.
+class CompactObservations:
+    def __init__(self):
+        self.genuine_scores = array("f")  # float32
+        self.impostor_scores = array("f")  # float32
+
+    # adds one (<label>,<score>) observation
+    def append(self, observation):
+        if observation[0] == 0:  # impostor
+            self.impostor_scores.append(observation[1])
+        else:  # genuine
+            self.genuine_scores.append(observation[1])
+
+    def __len__(self):
+        return len(self.genuine_scores) + len(self.impostor_scores)
+
+    # yields (<label>,<score>) elements, genuine ones first
+    def __iter__(self):
+        for score in self.genuine_scores:
+            yield (1, score)
+        for score in self.impostor_scores:
+            yield (0, score)
+
+
+# Returns the genuine and the impostor scores of the given observations, in this order.
+# Observations must be an array of (<label>,<score>) elements or CompactObservations.
+# Labels must be either 0 (impostor) or something else (genuine).
+def _split_scores(observations):
+    # compact observations are already split, nothing is copied
+    if isinstance(observations, CompactObservations):
+        return observations.genuine_scores, observations.impostor_scores
+
+    genuine_scores = []
+    impostor_scores = []
+
+    # for each given observation
+    for obs in observations:
+        if obs[0] == 0:  # impostor
+            impostor_scores.append(obs[1])
+        else:  # genuine
+            genuine_scores.append(obs[1])
+
+    return genuine_scores, impostor_scores
+
+
+# Sorts in place the [start, end) chunk of the float64 scores
+# stored in the shared memory block with the given name.
+def _sort_shared_chunk(chunk):
+    name, start, end = chunk
+
+    block = shared_memory.SharedMemory(name=name)
+    try:
+        scores = np.frombuffer(block.buf, dtype=np.float64)
+        scores[start:end].sort()
+        del scores  # releases the block buffer
+    finally:
+        block.close()
+
+
+# Sorts the scores of the given observations using the given number of worker processes.
+# Observations must be an array of (<label>,<score>) elements.
+# The scores are copied once into shared memory, each worker sorts one chunk of it in place,
+# and the sorted chunks are merged into the output list.
+def _parallel_sorted_scores(observations, workers):
+    scores = array("d", (obs[1] for obs in observations))
+    if len(scores) == 0:
+        return []
+
+    block = shared_memory.SharedMemory(create=True, size=len(scores) * scores.itemsize)
+    try:
+        with block.buf.cast("d") as shared_scores:
+            shared_scores[:] = scores
+            del scores  # only the shared copy is kept
+
+            # chunk boundaries, one chunk per worker
+            bounds = [
+                i * len(shared_scores) // workers for i in range(workers + 1)
+            ]
+            chunks = [(block.name, bounds[i], bounds[i + 1]) for i in range(workers)]
+            with multiprocessing.Pool(workers) as pool:
+                pool.map(_sort_shared_chunk, chunks)
+
+            # k-way merge of the sorted chunks; the sort detects the sorted runs
+            # and only merges them, in linear time per merge level
+            output = shared_scores.tolist()
+            output.sort()
+    finally:
+        block.close()
+        block.unlink()
+
+    return output
+
+
+# Returns the sorted list of all the scores of the given observations
+# (a float32 array, for CompactObservations).
+# If more than one worker is given and there are enough scores,
+# chunks of them are sorted in parallel by that many worker processes.
+# CompactObservations are always sorted by numpy in this process,
+# which is faster than handing their scores over to workers.
+def _sorted_scores(observations, workers=1):
+    # compact observations are sorted as a float32 array
+    if isinstance(observations, CompactObservations):
+        scores = np.concatenate(
+            [
+                np.frombuffer(observations.genuine_scores, dtype=np.float32),
+                np.frombuffer(observations.impostor_scores, dtype=np.float32),
+            ]
+        )
+        scores.sort()
+        return scores
+
+    if workers > 1 and len(observations) >= workers * _PARALLEL_SORT_MIN_CHUNK:
+        return _parallel_sorted_scores(observations, workers)
+
+    return sorted([obs[1] for obs in observations])
+
+
+# Opens the text file stored in the given file path,
+# decompressing it on the fly if it is a .gz, .bz2 or .xz file.
+def _open_text(file_path, mode="r"):
+    opener = _COMPRESSED_OPENERS.get(os.path.splitext(str(file_path))[1].lower())
+    if opener is None:
+        return open(file_path, mode)
+
+    return opener(file_path, mode + "t")
+
+
+# Reads decompressed blocks of bytes from the given binary file into the given buffer
+# until the stop event is set. An empty block marks the end of the file.
+# The codecs release the GIL while decompressing, so this overlaps with the parsing.
+def _read_blocks(f, buffer, stop):
+    try:
+        while not stop.is_set():
+            block = f.read(_READ_BLOCK_SIZE)
+            buffer.put(block)
+            if len(block) == 0:  # end of file
+                break
+    except Exception as e:  # noqa: BLE001 - handed over to _read_lines, which raises it
+        buffer.put(e)
+
+
+# Iterates over the lines of the text file stored in the given file path.
+# Compressed (.gz, .bz2 or .xz) files are decompressed by a background thread into
+# a bounded buffer, while the lines are decoded and split here; nothing is written to disk.
+# Lines end with "\n", as in the file.
+def _read_lines(file_path):
+    opener = _COMPRESSED_OPENERS.get(os.path.splitext(str(file_path))[1].lower())
+    if opener is None:
+        with open(file_path) as f:
+            yield from f
+        return
+
+    with opener(file_path, "rb") as f:
+        buffer = queue.Queue(maxsize=_READ_AHEAD_BLOCKS)
+        stop = threading.Event()
+        reader = threading.Thread(
+            target=_read_blocks, args=(f, buffer, stop), daemon=True
+        )
+        reader.start()
+        try:
+            # same text encoding as open()
+            decoder = codecs.getincrementaldecoder(locale.getpreferredencoding(False))()
+            rest = ""  # incomplete last line of the previous block
+            while True:
+                block = buffer.get()
+                if isinstance(block, Exception):
+                    raise block
+
+                lines = (rest + decoder.decode(block, final=len(block) == 0)).split("\n")
+                rest = lines.pop()
+                for line in lines:
+                    yield line + "\n"
+
+                if len(block) == 0:  # end of file
+                    if len(rest) > 0:
+                        yield rest
+                    break
+        finally:
+            # stops the reader, emptying the buffer in case it is waiting on it
+            stop.set()
+            while reader.is_alive():
+                try:
+                    buffer.get(timeout=0.1)
+                except queue.Empty:
+                    pass
+            reader.join()
+
+
 # Loads data from the CSV file stored in the given file path.
+# Files ending in .gz, .bz2 or .xz are decompressed on the fly.
 # Expected file line format: <label>,<score>
 # Comment lines starting with "#" will be ignored.
-# Output: array of (<label>,<score>) elements.
-def load_data(file_path):
+# Output: array of (<label>,<score>) elements,
+# or CompactObservations (float32 scores, no labels) if compact is True.
+def load_data(file_path, compact=False):
     # output
-    output = []  # empty content
+    output = CompactObservations() if compact else []  # empty content
 
-    # reads each line of the file,
+    # reads each line of the file, decompressing it if needed,
     # ignoring empty lines and the ones starting with '#'
-    with open(file_path) as f:
-        for line in f:
-            content = line.strip().split(",")
-            if (
-                len(content) > 0 and len(content[0]) > 0 and content[0][0] != "#"
-            ):  # valid line; other will be ignored
-                label = int(content[0])
-                score = float(content[1])
+    for line in _read_lines(file_path):
+        content = line.strip().split(",")
+        if (
+            len(content) > 0 and len(content[0]) > 0 and content[0][0] != "#"
+        ):  # valid line; other will be ignored
+            label = int(content[0])
+            score = float(content[1])
 
-                output.append((label, score))
+            output.append((label, score))
+
+    return output
+
+
+# Checks the given score distribution, given as
+# (<name of a numpy.random.Generator distribution method>, <parameters>...),
+# raising ValueError if it is unknown or if its parameters are not valid.
+def _check_distribution(distribution):
+    name = distribution[0] if len(distribution) > 0 else ""
+    if name not in _DISTRIBUTIONS:
+        raise ValueError("Unknown score distribution: " + str(name))
+
+    # trial draw on a throwaway generator
+    try:
+        getattr(np.random.default_rng(), distribution[0])(*distribution[1:], size=1)
+    except (TypeError, ValueError) as e:
+        raise ValueError(
+            "Invalid parameters for score distribution " + str(distribution) + ": " + str(e)
+        ) from e
+
+
+# Replaces the scores marked as ties with the last untied score before them,
+# or with the given previous score (None if there is none yet).
+# Output: the scores, and the last one of them (the next previous score).
+def _fill_ties(scores, ties, previous):
+    if len(scores) == 0:
+        return scores, previous
+
+    if previous is None:
+        ties[0] = False  # nothing to repeat yet
+        previous = np.nan  # never used
+
+    # index of the last untied score at each position (-1 if before the first one)
+    positions = np.maximum.accumulate(np.where(ties, -1, np.arange(len(scores))))
+    scores = np.where(positions >= 0, scores[positions], previous)
+
+    return scores, scores[-1]
+
+
+# Writes count synthetic observations, generated from the given seed, to the given file path.
+# Genuine and impostor scores follow the given distributions, each one given as
+# (<name of a numpy.random.Generator distribution method>, <parameters>...),
+# e.g. ("normal", 0.7, 0.1).
+# Genuine_ratio is the expected fraction of genuine observations (class imbalance).
+# Decimals is the number of decimals kept in each score; fewer decimals mean more ties
+# between and within classes. Tie_rate is the probability of an observation repeating
+# the score of the previous observation of the same class, which adds ties within
+# a class without changing its distribution.
+# If is_similar is False, scores express dissimilarities: the two distributions are swapped,
+# so genuine observations get the lower scores.
+# Output: a CSV file with <label>,<score> lines (compressed if ending in .gz, .bz2 or .xz),
+# or, if binary is True, two float32 files named <file path>.genuine and <file path>.impostor,
+# which load_binary_data reads back.
+# Observations are generated in vectorized chunks of _GENERATE_CHUNK_SIZE,
+# so memory use does not depend on count.
+def generate_data(
+    file_path,
+    count,
+    seed=0,
+    genuine=("normal", 0.7, 0.1),
+    impostor=("normal", 0.3, 0.1),
+    genuine_ratio=0.5,
+    decimals=4,
+    tie_rate=0.0,
+    is_similar=True,
+    binary=False,
+):
+    # checked before any file is written
+    _check_distribution(genuine)
+    _check_distribution(impostor)
+
+    rng = np.random.default_rng(seed)
+
+    # dissimilarities: genuine observations get the lower scores
+    if not is_similar:
+        genuine, impostor = impostor, genuine
+
+    with ExitStack() as stack:
+        if binary:
+            genuine_file = stack.enter_context(open(str(file_path) + ".genuine", "wb"))
+            impostor_file = stack.enter_context(open(str(file_path) + ".impostor", "wb"))
+        else:
+            csv_file = stack.enter_context(_open_text(file_path, "w"))
+            csv_file.write(
+                "# Synthetic data. All scores express "
+                + ("similarities.\n" if is_similar else "dissimilarities.\n")
+            )
+            csv_file.write("# label [0: impostor, 1: genuine], score\n")
+
+        previous_genuine = previous_impostor = None  # previous score of each class
+        remaining = count
+        while remaining > 0:
+            chunk_size = min(remaining, _GENERATE_CHUNK_SIZE)
+            remaining = remaining - chunk_size
+
+            is_genuine = rng.random(chunk_size) < genuine_ratio
+            ties = rng.random(chunk_size) < tie_rate
+            genuine_count = int(np.count_nonzero(is_genuine))
+
+            # draws the scores of each class, repeating the previous one of the same class on ties
+            genuine_scores = getattr(rng, genuine[0])(*genuine[1:], size=genuine_count)
+            genuine_scores, previous_genuine = _fill_ties(
+                np.round(genuine_scores, decimals), ties[is_genuine], previous_genuine
+            )
+            impostor_scores = getattr(rng, impostor[0])(
+                *impostor[1:], size=chunk_size - genuine_count
+            )
+            impostor_scores, previous_impostor = _fill_ties(
+                np.round(impostor_scores, decimals), ties[~is_genuine], previous_impostor
+            )
+
+            if binary:
+                genuine_scores.astype(np.float32).tofile(genuine_file)
+                impostor_scores.astype(np.float32).tofile(impostor_file)
+            else:
+                scores = np.empty(chunk_size)
+                scores[is_genuine] = genuine_scores
+                scores[~is_genuine] = impostor_scores
+
+                # formats the whole chunk at once
+                values = [None] * (2 * chunk_size)
+                values[0::2] = is_genuine.astype(np.int8).tolist()
+                values[1::2] = scores.tolist()
+                csv_file.write(("%d,%." + str(decimals) + "f\n") * chunk_size % tuple(values))
+
+
+# Loads the binary data written by generate_data (with binary=True) to the given file path,
+# that is, the float32 scores stored in <file path>.genuine and <file path>.impostor.
+# Output: CompactObservations.
+def load_binary_data(file_path):
+    # output
+    output = CompactObservations()
+
+    for scores, extension in (
+        (output.genuine_scores, ".genuine"),
+        (output.impostor_scores, ".impostor"),
+    ):
+        with open(str(file_path) + extension, "rb") as f:
+            scores.fromfile(f, os.fstat(f.fileno()).st_size // scores.itemsize)
 
     return output
 
 
 # Computes d-prime for the given observations.
-# Observations must be an array of (<label>,<score>) elements.
+# Observations must be an array of (<label>,<score>) elements or CompactObservations.
 # Labels must be either 0 (impostor) or something else (genuine).
 # If either the number of impostors or genuine observations is zero,
 # it returns 'NaN' as d-prime.
@@ -78,15 +488,7 @@ def compute_d_prime(observations):
     d_prime = float("NaN")  # nothing computed, returns not-a-number
 
     # separates genuine and impostor scores
-    genuine_scores = []
-    impostor_scores = []
-
-    # for each given observation
-    for obs in observations:
-        if obs[0] == 0:  # impostor
-            impostor_scores.append(obs[1])
-        else:  # genuine
-            genuine_scores.append(obs[1])
+    genuine_scores, impostor_scores = _split_scores(observations)
 
     # if there are values for both classes (impostor and genuine)
     if len(genuine_scores) > 0 and len(impostor_scores) > 0:
@@ -110,7 +512,7 @@ def compute_d_prime(observations):
 
 # Computes FMR from the given similarity observations,
 # according to the given threshold.
-# Observations must be an array of (<label>,<score>) elements.
+# Observations must be an array of (<label>,<score>) elements or CompactObservations.
 # Labels must be either 0 (impostor) or something else (genuine).
 # If the number of impostors is zero, it returns 'NaN' as FMR.
 def compute_sim_fmr(observations, threshold, is_similar = True):
@@ -120,12 +522,24 @@ def compute_sim_fmr(observations, threshold, is_similar = True):
     impostor_count = 0
     false_match_count = 0
 
-    # for each observation
-    for obs in observations:
-        if obs[0] == 0:  # impostor
-            impostor_count = impostor_count + 1
-            if obs[1] >= threshold or (obs[1] <= threshold and not is_similar):
-                false_match_count = false_match_count + 1
+    if isinstance(observations, CompactObservations):
+        # compares the float32 scores at once
+        impostor_scores = np.frombuffer(observations.impostor_scores, dtype=np.float32)
+        upper, lower = _float32_threshold(threshold)
+
+        impostor_count = len(impostor_scores)
+        false_matches = impostor_scores >= upper
+        if not is_similar:
+            false_matches |= impostor_scores <= lower
+        false_match_count = int(np.count_nonzero(false_matches))
+
+    else:
+        # for each observation
+        for obs in observations:
+            if obs[0] == 0:  # impostor
+                impostor_count = impostor_count + 1
+                if obs[1] >= threshold or (obs[1] <= threshold and not is_similar):
+                    false_match_count = false_match_count + 1
 
     # FMR computation
     if impostor_count > 0:
@@ -136,7 +550,7 @@ def compute_sim_fmr(observations, threshold, is_similar = True):
 
 # Computes FNMR from the given similarity observations,
 # according to the given threshold.
-# Observations must be an array of (<label>,<score>) elements.
+# Observations must be an array of (<label>,<score>) elements or CompactObservations.
 # Labels must be either 0 (impostor) or something else (genuine).
 # If the number of genuine observations is zero, it returns 'NaN' as FNMR.
 def compute_sim_fnmr(observations, threshold, is_similar = True):
@@ -146,13 +560,22 @@ def compute_sim_fnmr(observations, threshold, is_similar = True):
     genuine_count = 0
     false_non_match_count = 0
 
-    # for each observation
-    for obs in observations:
-        if obs[0] != 0:  # genuine observation
-            genuine_count = genuine_count + 1
+    if isinstance(observations, CompactObservations):
+        # compares the float32 scores at once
+        genuine_scores = np.frombuffer(observations.genuine_scores, dtype=np.float32)
+        upper = _float32_threshold(threshold)[0]
+
+        genuine_count = len(genuine_scores)
+        false_non_match_count = int(np.count_nonzero(genuine_scores < upper))
 
-            if obs[1] < threshold or (obs[1] < threshold and not is_similar):
-                false_non_match_count = false_non_match_count + 1
+    else:
+        # for each observation
+        for obs in observations:
+            if obs[0] != 0:  # genuine observation
+                genuine_count = genuine_count + 1
+
+                if obs[1] < threshold or (obs[1] < threshold and not is_similar):
+                    false_non_match_count = false_non_match_count + 1
 
     # FNMR computation
     if genuine_count > 0:
@@ -162,12 +585,13 @@ def compute_sim_fnmr(observations, threshold, is_similar = True):
 
 
 # Computes FNMR and FMR at EER from the given similarity observations.
-# Observations must be an array of (<label>,<score>) elements.
+# Observations must be an array of (<label>,<score>) elements or CompactObservations.
 # Labels must be either 0 (impostor) or something else (genuine).
+# Workers is the number of processes used to sort the scores (see _sorted_scores).
 # Output: FNMR, FMR, EER_THRESHOLD.
 # If either the number of impostors or genuine observations is zero,
 # it returns 'NaN', 'NaN', 'NaN'.
-def compute_sim_fmr_fnmr_eer(observations, is_similar = True):
+def compute_sim_fmr_fnmr_eer(observations, is_similar = True, workers = 1):
     # computed FNMR and FMR at EER, and EER threshold
     output_fnmr = float("NaN")  # nothing computed, returns not-a-number
     output_fmr = float("NaN")
@@ -177,7 +601,7 @@ def compute_sim_fmr_fnmr_eer(observations, is_similar = True):
     fnmr_fmr_diff = float("inf")  # a very large float
 
     # sorted list of scores
-    scores = sorted([obs[1] for obs in observations])
+    scores = _sorted_scores(observations, workers)
     if len(scores) > 0:
         # for each score taken as threshold
         for threshold in scores:
@@ -198,7 +622,7 @@ def compute_sim_fmr_fnmr_eer(observations, is_similar = True):
                 # updates current values
                 output_fnmr = current_fnmr
                 output_fmr = current_fmr
-                output_threshold = threshold
+                output_threshold = float(threshold)
 
             else:
                 # difference will start to increase, nothing to do anymore
@@ -208,18 +632,21 @@ def compute_sim_fmr_fnmr_eer(observations, is_similar = True):
 
 
 # Computes FMR x TMR (a.k.a. 1.0 - FNMR) AUC from the given similarity observations.
-# Observations must be an array of (<label>,<score>) elements.
+# Observations must be an array of (<label>,<score>) elements or CompactObservations.
 # Labels must be either 0 (impostor) or something else (genuine).
-# Output: AUC, array with FMR values, array with TMR values.
+# Workers is the number of processes used to sort the scores (see _sorted_scores).
+# Output: AUC, array with FMR values, array with TMR values
+# (array("d") values instead of lists, for CompactObservations).
 # If either the number of impostors or genuine observations is zero, it returns 'NaN', [], [].
-def compute_sim_fmr_tmr_auc(observations, is_similar = True):
-    # output values
+def compute_sim_fmr_tmr_auc(observations, is_similar = True, workers = 1):
+    # output values; compact observations keep them in float64 arrays
+    is_compact = isinstance(observations, CompactObservations)
     auc = float("NaN")  # nothing computed, returns not-a-number
-    fmrs = []
-    tmrs = []
+    fmrs = array("d") if is_compact else []
+    tmrs = array("d") if is_compact else []
 
     # sorted list of scores
-    scores = sorted([obs[1] for obs in observations])
+    scores = _sorted_scores(observations, workers)
     if len(scores) > 0:
         # for each score taken as a threshold
         for threshold in scores:
@@ -247,7 +674,7 @@ def compute_sim_fmr_tmr_auc(observations, is_similar = True):
                 fmrs.insert(0, 1.0)
                 tmrs.insert(0, 1.0)
 
-            auc_parts = []
+            auc_parts = array("d") if is_compact else []
             for i in range(len(fmrs) - 1):
                 auc_parts.append(
                     abs(fmrs[i] - fmrs[i + 1]) * (tmrs[i] + tmrs[i + 1]) / 2.0
@@ -258,17 +685,10 @@ def compute_sim_fmr_tmr_auc(observations, is_similar = True):
 
 
 # Plots the histograms of the scores of the impostors and of the genuine observations together.
-# Observations must be an array of (<label>,<score>) elements.
+# Observations must be an array of (<label>,<score>) elements or CompactObservations.
 # Labels must be either 0 (impostor) or something else (genuine).
 def plot_hist(observations):
-    impostors = []
-    genuine = []
-
-    for item in observations:
-        if item[0] == 0:
-            impostors.append(item[1])
-        else:
-            genuine.append(item[1])
+    genuine, impostors = _split_scores(observations)
 
     plt.xlabel("score")
     plt.ylabel("frequency")
@@ -287,13 +707,14 @@ def plot_hist(observations):
 
 
 # Plots the FMR x TMR AUC from the given similarity observations.
-# Observations must be an array of (<label>,<score>) elements.
+# Observations must be an array of (<label>,<score>) elements or CompactObservations.
 # Labels must be either 0 (impostor) or something else (genuine).
-def plot_sim_fmr_tmr_auc(observations, is_similar = True):
+# Workers is the number of processes used to sort the scores (see _sorted_scores).
+def plot_sim_fmr_tmr_auc(observations, is_similar = True, workers = 1):
     plt.xlabel("FMR")
     plt.ylabel("TMR")
 
-    auc, fmrs, tmrs = compute_sim_fmr_tmr_auc(observations, is_similar)
+    auc, fmrs, tmrs = compute_sim_fmr_tmr_auc(observations, is_similar, workers)
     if float("-inf") < auc < float("inf"):
         plt.plot(fmrs, tmrs, label="AUC: " + "{:.2f}".format(auc))
         plt.plot([0, 1], [0, 1], color="gray", linestyle="--")
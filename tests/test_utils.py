@@ -1,4 +1,7 @@
 # test_utils.py
+import lzma
+import tracemalloc
+
 import matplotlib as plt
 import pytest
 from pytest_check import check
@@ -77,6 +80,268 @@ def test_load_data():
     assert len(output) > 0
 
 
+def test_load_data_compact():
+    output = utils.load_data("src/data/s1.csv", compact=True)
+    with check:
+        assert len(output) == len(utils.load_data("src/data/s1.csv"))
+    with check:
+        assert output.genuine_scores.typecode == "f"
+    with check:
+        assert output.impostor_scores.typecode == "f"
+
+
+@pytest.mark.parametrize("extension", [".gz", ".bz2", ".xz"])
+def test_load_data_compressed(tmp_path, extension):
+    file_path = tmp_path / ("s1.csv" + extension)
+    with utils._open_text(file_path, "w") as f, open("src/data/s1.csv") as source:
+        f.write(source.read())
+    assert utils.load_data(file_path) == utils.load_data("src/data/s1.csv")
+
+
+def test_load_data_compressed_nofile():
+    with pytest.raises(Exception):
+        utils.load_data("nofile.csv.gz")
+
+
+def test_read_lines_compressed(tmp_path):
+    file_path = tmp_path / "lines.txt.gz"
+    with utils._open_text(file_path, "w") as f:
+        f.writelines(f"{i}\n" for i in range(100000))
+        f.write("last")  # no line break
+    lines = list(utils._read_lines(file_path))
+    with check:
+        assert len(lines) == 100001
+    with check:
+        assert lines[0] == "0\n"
+    with check:
+        assert lines[-2:] == ["99999\n", "last"]
+
+
+def test_read_lines_compressed_block_boundary(tmp_path, monkeypatch):
+    monkeypatch.setattr(utils, "_READ_BLOCK_SIZE", 3)
+    file_path = tmp_path / "lines.txt.xz"
+    with lzma.open(file_path, "wt", encoding="utf-8") as f:
+        f.write("é1\nab\n\nx")
+    monkeypatch.setattr(utils.locale, "getpreferredencoding", lambda do_setlocale: "utf-8")
+    assert list(utils._read_lines(file_path)) == ["é1\n", "ab\n", "\n", "x"]
+
+
+def test_read_lines_compressed_early_close(tmp_path):
+    file_path = tmp_path / "lines.txt.bz2"
+    with utils._open_text(file_path, "w") as f:
+        f.writelines(f"{i}\n" for i in range(100000))
+    lines = utils._read_lines(file_path)
+    with check:
+        assert next(lines) == "0\n"
+    lines.close()  # stops the background reader
+    with check:
+        assert list(utils._read_lines(file_path))[-1] == "99999\n"
+
+
+def test_read_lines_compressed_error(tmp_path):
+    file_path = tmp_path / "lines.txt.gz"
+    file_path.write_bytes(b"not gzip data")
+    with pytest.raises(OSError):
+        list(utils._read_lines(file_path))
+
+
+# Test compact observations
+def _compact(observations):
+    compact = utils.CompactObservations()
+    for obs in observations:
+        compact.append(obs)
+    return compact
+
+
+def test_compact_iter():
+    compact = _compact([(0, 0.5), (2, 0.25), (1, 0.75)])
+    assert list(compact) == [(1, 0.25), (1, 0.75), (0, 0.5)]
+
+
+def test_compact_metrics():
+    observations = [(0, 0.2), (0, 0.3), (0, 0.4), (1, 0.5), (1, 0.6), (1, 0.7)]
+    compact = _compact(observations)
+    with check:
+        assert utils.compute_d_prime(compact) == pytest.approx(
+            utils.compute_d_prime(observations), rel=1e-6
+        )
+    with check:
+        assert utils.compute_sim_fmr(compact, 0.35) == utils.compute_sim_fmr(observations, 0.35)
+    with check:
+        assert utils.compute_sim_fnmr(compact, 0.55) == utils.compute_sim_fnmr(observations, 0.55)
+    with check:
+        assert utils.compute_sim_fmr_fnmr_eer(compact)[:2] == utils.compute_sim_fmr_fnmr_eer(observations)[:2]
+    with check:
+        assert utils.compute_sim_fmr_tmr_auc(compact)[0] == utils.compute_sim_fmr_tmr_auc(observations)[0]
+
+
+def test_compact_threshold_rounding():
+    compact = _compact([(0, 0.1), (1, 0.1)])
+    # 0.1 as float32 is slightly above 0.1, and slightly below 0.1 + 1e-8
+    with check:
+        assert utils.compute_sim_fmr(compact, 0.1) == 1.0
+    with check:
+        assert utils.compute_sim_fmr(compact, 0.1 + 1e-8) == 0.0
+    with check:
+        assert utils.compute_sim_fnmr(compact, 0.1 + 1e-8) == 1.0
+
+
+def test_compact_threshold_rounding_half_ulp():
+    observations = [(0, 0.1), (1, 0.1)]
+    compact = _compact(observations)
+    score = compact.impostor_scores[0]  # 0.1 as float32
+    # thresholds less than half a float32 ulp away from the score
+    for threshold in [score + 1e-12, score - 1e-12]:
+        tuples = [(label, score) for label, _ in observations]
+        with check:
+            assert utils.compute_sim_fmr(compact, threshold) == utils.compute_sim_fmr(tuples, threshold)
+        with check:
+            assert utils.compute_sim_fmr(compact, threshold, False) == utils.compute_sim_fmr(tuples, threshold, False)
+        with check:
+            assert utils.compute_sim_fnmr(compact, threshold) == utils.compute_sim_fnmr(tuples, threshold)
+
+
+def test_compact_EER_threshold_type():
+    compact = _compact([(0, 0.2), (0, 0.3), (0, 0.4), (1, 0.5), (1, 0.6), (1, 0.7)])
+    assert type(utils.compute_sim_fmr_fnmr_eer(compact)[2]) is float
+
+
+def test_compact_peak_memory():
+    compact = utils.CompactObservations()
+    compact.impostor_scores.extend(i / 100.0 for i in range(100))
+    compact.genuine_scores.extend(10.0 + (i % 1000) / 100.0 for i in range(1000000))
+    store_size = 4 * len(compact)
+
+    tracemalloc.start()
+    try:
+        utils.compute_sim_fmr_fnmr_eer(compact)
+        eer_peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.reset_peak()
+        utils.compute_d_prime(compact)
+        d_prime_peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    with check:
+        assert eer_peak < 2 * store_size
+    with check:
+        assert d_prime_peak < store_size / 2
+
+
+def test_compact_empty():
+    compact = utils.CompactObservations()
+    with check:
+        assert not float("-inf") < utils.compute_d_prime(compact) < float("inf")
+    with check:
+        assert not float("-inf") < utils.compute_sim_fmr_fnmr_eer(compact)[0] < float("inf")
+    with check:
+        assert not float("-inf") < utils.compute_sim_fmr_tmr_auc(compact)[0] < float("inf")
+
+
+# Test generate_data function
+def test_generate_data(tmp_path):
+    file_path = tmp_path / "synthetic.csv"
+    utils.generate_data(file_path, 1000, seed=1)
+    output = utils.load_data(file_path)
+    with check:
+        assert len(output) == 1000
+    with check:
+        assert utils.compute_d_prime(output) > 3.0
+
+
+def test_generate_data_seeded(tmp_path):
+    utils.generate_data(tmp_path / "a.csv", 1000, seed=1)
+    utils.generate_data(tmp_path / "b.csv", 1000, seed=1)
+    utils.generate_data(tmp_path / "c.csv", 1000, seed=2)
+    with check:
+        assert (tmp_path / "a.csv").read_text() == (tmp_path / "b.csv").read_text()
+    with check:
+        assert (tmp_path / "a.csv").read_text() != (tmp_path / "c.csv").read_text()
+
+
+def test_generate_data_options(tmp_path):
+    file_path = tmp_path / "synthetic.csv.gz"
+    utils.generate_data(
+        file_path, 1000, seed=1, genuine_ratio=0.1, tie_rate=0.5, is_similar=False
+    )
+    output = utils.load_data(file_path)
+    genuine_scores, impostor_scores = utils._split_scores(output)
+    with check:
+        assert len(genuine_scores) < len(impostor_scores)
+    with check:
+        assert len({obs[1] for obs in output}) < 700
+    with check:
+        assert max(genuine_scores) < max(impostor_scores)
+
+
+def test_generate_data_ties_keep_distributions(tmp_path):
+    utils.generate_data(tmp_path / "no_ties.csv", 20000, seed=1)
+    expected = utils.load_data(tmp_path / "no_ties.csv")
+    expected_genuine, expected_impostor = utils._split_scores(expected)
+
+    for tie_rate in [0.5, 0.9]:
+        utils.generate_data(tmp_path / "ties.csv", 20000, seed=1, tie_rate=tie_rate)
+        output = utils.load_data(tmp_path / "ties.csv")
+        genuine_scores, impostor_scores = utils._split_scores(output)
+        with check:
+            assert len({obs[1] for obs in output}) < len({obs[1] for obs in expected})
+        with check:
+            assert sum(genuine_scores) / len(genuine_scores) == pytest.approx(
+                sum(expected_genuine) / len(expected_genuine), abs=0.02
+            )
+        with check:
+            assert sum(impostor_scores) / len(impostor_scores) == pytest.approx(
+                sum(expected_impostor) / len(expected_impostor), abs=0.02
+            )
+        with check:
+            assert utils.compute_d_prime(output) == pytest.approx(
+                utils.compute_d_prime(expected), abs=0.25
+            )
+
+
+def test_generate_data_binary(tmp_path):
+    utils.generate_data(tmp_path / "synthetic.csv", 1000, seed=1, decimals=6)
+    utils.generate_data(tmp_path / "synthetic", 1000, seed=1, decimals=6, binary=True)
+    expected = utils.load_data(tmp_path / "synthetic.csv", compact=True)
+    output = utils.load_binary_data(tmp_path / "synthetic")
+    with check:
+        assert isinstance(output, utils.CompactObservations)
+    with check:
+        assert output.genuine_scores == expected.genuine_scores
+    with check:
+        assert output.impostor_scores == expected.impostor_scores
+
+
+def test_generate_data_unknown_distribution(tmp_path):
+    with pytest.raises(ValueError):
+        utils.generate_data(tmp_path / "synthetic.csv", 10, genuine=("seed", 1))
+
+
+def test_generate_data_invalid_parameters(tmp_path):
+    file_path = tmp_path / "synthetic.csv"
+    with check, pytest.raises(ValueError):
+        utils.generate_data(file_path, 10, genuine=("normal", 0.7, 0.1, 0.5))
+    with check, pytest.raises(ValueError):
+        utils.generate_data(file_path, 10, impostor=("normal", 0.3, -1.0))
+    with check:
+        assert not file_path.exists()
+
+
+def test_generate_data_distributions(tmp_path):
+    file_path = tmp_path / "synthetic.csv"
+    utils.generate_data(
+        file_path,
+        1000,
+        genuine=("triangular", 0.5, 0.9, 1.0),
+        impostor=("exponential", 0.1),
+    )
+    genuine_scores, impostor_scores = utils._split_scores(utils.load_data(file_path))
+    with check:
+        assert min(genuine_scores) >= 0.5
+    with check:
+        assert min(impostor_scores) >= 0.0
+
+
 # Test compute d prime
 def test_compute_d_prime_none():
     with pytest.raises(Exception):
@@ -295,6 +560,44 @@ def test_AUC_none_exception():
         utils.compute_sim_fmr_tmr_auc(None)
 
 
+# Test parallel sort of scores
+def test_parallel_sorted_scores_empty():
+    assert utils._parallel_sorted_scores([], 2) == []
+
+
+def test_parallel_sorted_scores():
+    observations = [(i % 2, (i * 7919) % 1000 / 10.0) for i in range(1000)]
+    assert utils._parallel_sorted_scores(observations, 3) == utils._sorted_scores(observations)
+
+
+def test_EER_AUC_workers(monkeypatch):
+    # makes the EER and AUC entry points take the parallel sort
+    monkeypatch.setattr(utils, "_PARALLEL_SORT_MIN_CHUNK", 1)
+    parallel_calls = []
+    parallel_sorted_scores = utils._parallel_sorted_scores
+
+    def counted_parallel_sorted_scores(observations, workers):
+        parallel_calls.append(workers)
+        return parallel_sorted_scores(observations, workers)
+
+    monkeypatch.setattr(utils, "_parallel_sorted_scores", counted_parallel_sorted_scores)
+
+    observations = [(0, 0.2), (0, 0.3), (0, 0.4), (1, 0.5), (1, 0.6), (1, 0.7)]
+    compact = _compact(observations)
+    with check:
+        assert utils.compute_sim_fmr_fnmr_eer(observations, workers=2) == utils.compute_sim_fmr_fnmr_eer(observations)
+    with check:
+        assert utils.compute_sim_fmr_tmr_auc(observations, workers=2) == utils.compute_sim_fmr_tmr_auc(observations)
+    with check:
+        assert parallel_calls == [2, 2]
+
+    # compact observations keep the serial numpy sort
+    with check:
+        assert utils.compute_sim_fmr_fnmr_eer(compact, workers=2) == utils.compute_sim_fmr_fnmr_eer(compact)
+    with check:
+        assert parallel_calls == [2, 2]
+
+
 # Test matplotlib import
 def test_matplotlib():
     assert plt.__version__ is not None